@@ -1,84 +1,73 @@
 #!/usr/bin/env python3
 
 import re
+from functools import lru_cache
 from pathlib import Path
 import anki
 from anki.collection import Collection
-from datetime import datetime, timedelta
 
+# Patterns for existing badges, compiled once at import.
+_VOCAB_RE = re.compile(r'!\[.*?\]\(https://img\.shields\.io/badge/(?:词汇|Anki%20Chinese%20Cards)-\d+-blue\)')
+_STREAK_RE = re.compile(r'!\[Day Streak\]\(https://img\.shields\.io/badge/Day%20Streak-\d+-orange\)')
 
-def get_seen_words_count():
+
+@lru_cache(maxsize=1)
+def _find_col_path():
     col_path = Path.home() / "AppData/Roaming/Anki2/User 1/collection.anki2"
     if not col_path.exists():
         col_path = Path.home() / ".local/share/Anki2/User 1/collection.anki2"
     if not col_path.exists():
         col_path = Path.home() / "Library/Application Support/Anki2/User 1/collection.anki2"
-    
+
     if not col_path.exists():
         raise FileNotFoundError("Anki collection not found")
-    
-    col = Collection(str(col_path))
+
+    return col_path
+
+
+def get_seen_words_count(col):
     deck_id = col.decks.id("Mandarin: Vocabulary")
     
     if not deck_id:
         raise ValueError("Deck 'Mandarin: Vocabulary' not found")
     
-    card_ids = col.decks.cids(deck_id, children=True)
-    seen_count = 0
-    
-    for card_id in card_ids:
-        card = col.get_card(card_id)
-        if card.reps > 0:
-            seen_count += 1
-    
-    col.close()
-    return seen_count
+    # Count in SQL rather than hydrating a Card object per ID just to
+    # read its reps field.
+    deck_ids = col.decks.deck_and_child_ids(deck_id)
+    placeholders = ", ".join("?" * len(deck_ids))
+    return col.db.scalar(
+        f"SELECT COUNT(*) FROM cards WHERE did IN ({placeholders}) AND reps > 0",
+        *deck_ids,
+    )
 
 
-def get_current_streak():
-    col_path = Path.home() / "AppData/Roaming/Anki2/User 1/collection.anki2"
-    if not col_path.exists():
-        col_path = Path.home() / ".local/share/Anki2/User 1/collection.anki2"
-    if not col_path.exists():
-        col_path = Path.home() / "Library/Application Support/Anki2/User 1/collection.anki2"
-    
-    if not col_path.exists():
-        raise FileNotFoundError("Anki collection not found")
-    
-    col = Collection(str(col_path))
-    
-    # Get review history (revlog table contains review timestamps)
+def get_current_streak(col):
+    # Walk backwards from today inside SQLite (revlog ids are review
+    # timestamps in ms), stopping at the first day without a review.
+    # Each day's probe filters on an id range so it's an index seek on
+    # the primary key rather than a date() expression scan of the table.
     query = """
-    SELECT DISTINCT date(id/1000, 'unixepoch', 'localtime') as review_date
-    FROM revlog 
-    ORDER BY review_date DESC
+    WITH RECURSIVE streak(day, n) AS (
+        SELECT date('now', 'localtime'), 0
+        UNION ALL
+        SELECT date(day, '-1 day'), n + 1
+        FROM streak
+        WHERE EXISTS (
+            SELECT 1 FROM revlog
+            WHERE id >= strftime('%s', day, 'utc') * 1000
+              AND id < strftime('%s', date(day, '+1 day'), 'utc') * 1000
+        )
+    )
+    SELECT MAX(n) FROM streak
     """
-    
-    rows = col.db.all(query)
-    col.close()
-    
-    if not rows:
-        return 0
-    
-    # Convert to datetime objects and check for consecutive days
-    today = datetime.now().date()
-    streak = 0
-    
-    for i, (date_str,) in enumerate(rows):
-        review_date = datetime.strptime(date_str, '%Y-%m-%d').date()
-        expected_date = today - timedelta(days=i)
-        
-        if review_date == expected_date:
-            streak += 1
-        else:
-            break
-    
-    return streak
+
+    return col.db.scalar(query) or 0
 
 
 def update_readme_badge(word_count, streak):
     readme_path = Path("README.md")
-    content = readme_path.read_text(encoding='utf-8')
+    original = readme_path.read_text(encoding='utf-8')
+    content = original
     
     # Create badges
     vocab_badge_url = f"https://img.shields.io/badge/Anki%20Chinese%20Cards-{word_count}-blue"
@@ -87,38 +76,51 @@ def update_readme_badge(word_count, streak):
     streak_badge_url = f"https://img.shields.io/badge/Day%20Streak-{streak}-orange"
     streak_badge_markdown = f"![Day Streak]({streak_badge_url})"
     
-    # Patterns for existing badges
-    vocab_pattern = r'!\[.*?\]\(https://img\.shields\.io/badge/(?:词汇|Anki%20Chinese%20Cards)-\d+-blue\)'
-    streak_pattern = r'!\[Day Streak\]\(https://img\.shields\.io/badge/Day%20Streak-\d+-orange\)'
-    
-    # Update or add vocabulary badge
-    if re.search(vocab_pattern, content):
-        content = re.sub(vocab_pattern, vocab_badge_markdown, content)
-    else:
-        lines = content.split('\n')
-        lines.insert(1, '')
-        lines.insert(2, vocab_badge_markdown)
-        content = '\n'.join(lines)
-    
+    # Update or add vocabulary badge; subn replaces and detects a miss
+    # in one scan instead of a search followed by a sub.
+    content, replaced = _VOCAB_RE.subn(vocab_badge_markdown, content, count=1)
+    if not replaced:
+        # Splice after the title line; no need to split the whole README
+        # into a list and rejoin it.
+        idx = content.find('\n')
+        if idx == -1:
+            # Single-line README: append below the title.
+            content += '\n\n' + vocab_badge_markdown
+        else:
+            content = content[:idx + 1] + '\n' + vocab_badge_markdown + '\n' + content[idx + 1:]
+
     # Update or add streak badge
-    if re.search(streak_pattern, content):
-        content = re.sub(streak_pattern, streak_badge_markdown, content)
-    else:
-        lines = content.split('\n')
-        # Find where to insert the streak badge (after the vocab badge)
-        for i, line in enumerate(lines):
-            if 'Anki Chinese Cards' in line or '词汇' in line:
-                lines.insert(i + 1, streak_badge_markdown)
-                break
-        content = '\n'.join(lines)
-    
+    content, replaced = _STREAK_RE.subn(streak_badge_markdown, content, count=1)
+    if not replaced:
+        # Insert on the line after the vocab badge
+        anchor = content.find('Anki Chinese Cards')
+        if anchor == -1:
+            anchor = content.find('词汇')
+        if anchor != -1:
+            end = content.find('\n', anchor)
+            if end == -1:
+                content += '\n' + streak_badge_markdown
+            else:
+                content = content[:end + 1] + streak_badge_markdown + '\n' + content[end + 1:]
+
+    # Skip the write when the badges already show these values, so no-op
+    # runs don't touch the file's mtime or wake filesystem watchers.
+    if content == original:
+        return
+
     readme_path.write_text(content, encoding='utf-8')
 
 
 def main():
     try:
-        word_count = get_seen_words_count()
-        streak = get_current_streak()
+        # Opening the collection is expensive (schema checks, media DB
+        # init), so do it once and share it.
+        col = Collection(str(_find_col_path()))
+        try:
+            word_count = get_seen_words_count(col)
+            streak = get_current_streak(col)
+        finally:
+            col.close()
         update_readme_badge(word_count, streak)
         print(f"Updated badges: {word_count} Anki Chinese cards, {streak} day streak")
     except Exception as e:
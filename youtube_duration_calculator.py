@@ -4,47 +4,108 @@ YouTube Video Duration Calculator
 Calculates total duration of YouTube videos from a CSV file for language immersion tracking.
 """
 
+import asyncio
 import csv
+import itertools
+import re
+import sqlite3
 import sys
-import yt_dlp
+import time
+from pathlib import Path
+
+import httpx
+
+# Fetches are multiplexed over a few HTTP/2 connections; kept modest to
+# stay under YouTube's per-IP rate limits.
+MAX_CONNECTIONS = 10
+
+# Innertube player endpoint: returns ~20 KB of gzipped JSON per video
+# versus the ~3 MB watch page yt-dlp would pull just to read a duration.
+INNERTUBE_PLAYER_URL = "https://www.youtube.com/youtubei/v1/player"
+INNERTUBE_CLIENT = {"clientName": "WEB", "clientVersion": "2.20240101"}
+
+# Durations are immutable, so cache them on disk and skip the network
+# entirely on repeat runs.
+CACHE_PATH = Path.home() / ".cache" / "yt_durations.db"
+
+_cache_conn: sqlite3.Connection | None = None
+# Rows fetched this run, written in one executemany at the end to
+# amortize fsync cost.
+_pending_cache_rows: list[tuple[str, int, str, int]] = []
+
+
+def _cache_db() -> sqlite3.Connection:
+    """Open the on-disk duration cache, creating it on first use."""
+    global _cache_conn
+    if _cache_conn is None:
+        CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(CACHE_PATH))
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS dur("
+            "id TEXT PRIMARY KEY, seconds INT, title TEXT, fetched_at INT)"
+        )
+        _cache_conn = conn
+    return _cache_conn
+
+
+def _flush_cache() -> None:
+    """Write all rows fetched this run to the cache in one transaction."""
+    if not _pending_cache_rows or _cache_conn is None:
+        return
+    with _cache_conn:
+        _cache_conn.executemany(
+            "INSERT OR REPLACE INTO dur VALUES (?, ?, ?, ?)",
+            _pending_cache_rows,
+        )
+    _pending_cache_rows.clear()
+
+
+# Matches https://youtu.be/VIDEO_ID[?si=...] and
+# https://www.youtube.com/watch?v=VIDEO_ID[&...] in one pass.
+_VIDEO_ID_RE = re.compile(r'(?:youtu\.be/|youtube\.com/watch\?(?:.*?&)?v=)([A-Za-z0-9_-]{11})')
 
 
 def extract_video_id(url: str) -> str | None:
     """Extract video ID from various YouTube URL formats."""
-    # Handle different YouTube URL formats
-    if "youtu.be/" in url:
-        # Format: https://youtu.be/VIDEO_ID or https://youtu.be/VIDEO_ID?si=XXXX
-        video_id = url.split("youtu.be/")[-1].split("?")[0]
-    elif "youtube.com/watch" in url:
-        # Format: https://www.youtube.com/watch?v=VIDEO_ID
-        if "v=" in url:
-            video_id = url.split("v=")[-1].split("&")[0]
-        else:
-            return None
-    else:
+    # Cheap substring rejection before paying for the regex scan.
+    if "youtu" not in url:
         return None
-
-    return video_id if video_id else None
+    match = _VIDEO_ID_RE.search(url)
+    return match.group(1) if match else None
 
 
-def get_video_duration(url: str) -> int:
+async def get_video_duration(client: httpx.AsyncClient, url: str) -> int:
     """
-    Fetch video duration in seconds using yt-dlp.
+    Fetch video duration in seconds from the YouTube Innertube player API.
     Returns 0 if unable to fetch duration.
     """
-    ydl_opts = {
-        'quiet': True,
-        'no_warnings': True,
-        'extract_flat': False,  # Get full info including duration
-    }
-
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(url, download=False)
-            duration = info.get('duration', 0)
-            title = info.get('title', 'Unknown')
-            print(f"  ✓ {title[:50]}{'...' if len(title) > 50 else ''} - {format_duration(duration)}")
+        video_id = extract_video_id(url)
+        if not video_id:
+            raise ValueError("could not extract video ID")
+
+        cached = _cache_db().execute(
+            "SELECT seconds, title FROM dur WHERE id=?", (video_id,)
+        ).fetchone()
+        if cached:
+            duration, title = cached
+            print(f"  ✓ {title[:50]}{'...' if len(title) > 50 else ''} - {format_duration(duration)} (cached)")
             return duration
+
+        response = await client.post(
+            INNERTUBE_PLAYER_URL,
+            json={"context": {"client": INNERTUBE_CLIENT}, "videoId": video_id},
+        )
+        response.raise_for_status()
+        details = response.json().get('videoDetails', {})
+        duration = int(details.get('lengthSeconds', 0))
+        title = details.get('title', 'Unknown')
+        if duration > 0:
+            _pending_cache_rows.append((video_id, duration, title, int(time.time())))
+        print(f"  ✓ {title[:50]}{'...' if len(title) > 50 else ''} - {format_duration(duration)}")
+        return duration
     except Exception as e:
         print(f"  ✗ Error fetching {url}: {str(e)[:50]}")
         return 0
@@ -64,6 +125,29 @@ def format_duration(seconds: int) -> str:
         return f"{secs}s"
 
 
+def iter_urls(csv_file: str):
+    """Yield non-empty URLs from the CSV one row at a time."""
+    with open(csv_file, 'r', encoding='utf-8') as file:
+        for row in csv.DictReader(file):
+            url = (row.get('URL') or '').strip()
+            if url:
+                yield url
+
+
+async def _fetch_all(csv_file: str, url_count: int) -> list[int]:
+    """Fetch all durations concurrently over shared HTTP/2 connections."""
+    progress = itertools.count(1)
+
+    async def process(url: str) -> int:
+        i = next(progress)
+        print(f"[{i}/{url_count}] Processing: {url[:60]}{'...' if len(url) > 60 else ''}")
+        return await get_video_duration(client, url)
+
+    limits = httpx.Limits(max_connections=MAX_CONNECTIONS)
+    async with httpx.AsyncClient(http2=True, limits=limits, timeout=10) as client:
+        return await asyncio.gather(*(process(url) for url in iter_urls(csv_file)))
+
+
 def calculate_total_duration(csv_file: str) -> float:
     """
     Read CSV file and calculate total duration of all videos.
@@ -77,28 +161,24 @@ def calculate_total_duration(csv_file: str) -> float:
     print("=" * 60)
 
     try:
+        # Cheap line count for the [i/N] denominator (minus the header);
+        # the rows themselves are streamed straight into the fetchers.
         with open(csv_file, 'r', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
-            urls = [row['URL'] for row in reader if row.get('URL')]
-
-            if not urls:
-                print("No URLs found in CSV file")
-                return 0
+            url_count = max(sum(1 for _ in file) - 1, 0)
 
-            print(f"Found {len(urls)} videos to process\n")
+        if url_count == 0:
+            print("No URLs found in CSV file")
+            return 0
 
-            for i, url in enumerate(urls, 1):
-                url = url.strip()
-                if not url:
-                    continue
+        print(f"Found {url_count} videos to process\n")
 
-                print(f"[{i}/{len(urls)}] Processing: {url[:60]}{'...' if len(url) > 60 else ''}")
-                video_count += 1
+        for duration in asyncio.run(_fetch_all(csv_file, url_count)):
+            video_count += 1
+            if duration > 0:
+                total_seconds += duration
+                successful_count += 1
 
-                duration = get_video_duration(url)
-                if duration > 0:
-                    total_seconds += duration
-                    successful_count += 1
+        _flush_cache()
 
     except FileNotFoundError:
         print(f"Error: File '{csv_file}' not found")
@@ -170,4 +250,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()